@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
-import webview
+import functools
 import os
 import re
-import uuid
 import json
-import xml.etree.ElementTree as ET
+import pickle
 import sys
+import threading
+# webview is imported where used to keep startup light
 
 # Backend selection: try python-sword first; if unavailable, fall back to pysword
 BACKEND = None  # 'python-sword' | 'pysword'
@@ -36,12 +37,42 @@ TRANSLATION_MODULE_IDS = ["LEB"]  # Only LEB supported
 
 # Optional local Strong's JSON (public domain) fallback
 LOCAL_STRONGS = None  # dict like {"3056": "word, message"}
-
-
-# --- 1. Data Structure Classes (Unchanged) ---
+_LOCAL_STRONGS_PATH = None  # JSON file found at startup, parsed on first use
+_LOCAL_STRONGS_LOADED = False
+_LOCAL_STRONGS_LOCK = threading.Lock()
+# Bump when the normalization in _read_local_strongs changes so existing pickles are rebuilt
+_LOCAL_STRONGS_PICKLE_VERSION = 1
+
+# Per-chapter verse counts keyed by lowercased book name/OSIS id (data/nt_verse_counts.json)
+NT_VERSE_COUNTS = None
+# Last verse number per (book, chapter), learned from failed lookups when probing for chapter ends
+_CHAPTER_ENDS = {}
+
+# Precompiled patterns (compiled once at import instead of per verse/reference)
+# One pass per <w> tag: the lemma attribute (e.g. lemma="lemma.Strong:ἀρχή strong:G0746")
+# yields the Greek lemma and the Strong's digits without leading zeros (G0746 -> 746)
+# Stdlib re on purpose: google-re2 measured ~10x slower here, since verses are short and
+# per-match wrapper overhead outweighs DFA matching (scanning is a small share of fetch time anyway).
+# Same for expat: ElementTree.fromstring over a <root>-wrapped verse was slower than this
+# pattern before even splitting the lemma attribute, and it chokes on stray entities
+_WORD_RE = re.compile(
+    r'<w(?:\s+lemma="'
+    r'(?:[^"]*?lemma\.Strong:(?P<lemma>[^\s"]+))?'
+    r'(?:[^"]*?(?i:strong: *G0*)(?P<strong_digits>\d+))?'
+    r'[^"]*")?'
+    r'(?:\s+morph="\s*(?P<morph>[^"]*?)\s*")?'
+    r'>(?P<greek_word>[^<]+)</w>'
+)
+_TAG_STRIP_RE = re.compile(r"<[^>]+>")
+_REF_SPLIT = re.compile(r"[ :]")
+
+
+# --- 1. Data Structure Classes ---
 
 class InterlinearWord:
     """Holds all extracted interlinear data for a single Greek word."""
+    __slots__ = ('greek_word', 'lemma', 'morphology', 'strongs_number', 'en_gloss', 'tr_transliteration')
+
     def __init__(self, greek_word, lemma, morphology, strongs_number, en_gloss, tr_transliteration=None):
         self.greek_word = greek_word
         self.lemma = lemma
@@ -63,6 +94,8 @@ class InterlinearWord:
 
 class InterlinearVerse:
     """Holds all interlinear data for a single Bible verse."""
+    __slots__ = ('book', 'chapter', 'verse', 'words', 'free_translation', 'literal_translation')
+
     def __init__(self, book, chapter, verse, free_translation="", literal_translation=""):
         self.book = book
         self.chapter = chapter
@@ -85,8 +118,7 @@ class InterlinearVerse:
     @classmethod
     def from_dict(cls, data):
         """Reconstructs the Python object from the JSON data sent by the frontend."""
-        ref_parts = re.split(r'[ :]', data['verse_ref'])
-        book, chapter, verse = ref_parts[0], int(ref_parts[1]), int(ref_parts[2])
+        book, chapter, verse = _split_verse_ref(data['verse_ref'])
         
         verse_obj = cls(book, chapter, verse, 
                             free_translation=data['free_translation'],
@@ -100,6 +132,12 @@ class InterlinearVerse:
         self.words.append(word_object)
 
 
+def _split_verse_ref(verse_ref: str) -> tuple:
+    """Split a "Book chapter:verse" reference (as produced by get_verse_ref) into (book, chapter, verse)."""
+    ref_parts = _REF_SPLIT.split(verse_ref)
+    return ref_parts[0], int(ref_parts[1]), int(ref_parts[2])
+
+
 # --- 2. SWORD Initialization and Data Extraction (UPDATED) ---
 
 # --- CRITICAL: PyInstaller Path-Finding Logic ---
@@ -112,27 +150,95 @@ def find_repo_path(relative_path):
         
     return os.path.join(base_path, relative_path)
 
-def _try_load_local_strongs_json():
-    """Load a local JSON Strong's Greek lexicon if present."""
-    global LOCAL_STRONGS
+def _find_local_strongs_json():
+    """Locate a local JSON Strong's Greek lexicon; parsing is deferred to the first lookup."""
+    global LOCAL_STRONGS, _LOCAL_STRONGS_PATH, _LOCAL_STRONGS_LOADED
+    LOCAL_STRONGS = None
+    _LOCAL_STRONGS_PATH = None
+    _LOCAL_STRONGS_LOADED = False
     candidates = [
         find_repo_path(os.path.join('data', 'strongs_greek.json')),
         find_repo_path(os.path.join('data', 'strongs_greek.sample.json')),
     ]
     for p in candidates:
         if os.path.exists(p):
-            try:
-                with open(p, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                # Normalize keys to digits only (e.g., "3056")
-                LOCAL_STRONGS = {str(k).lstrip('Gg'): v for k, v in data.items()}
-                print(f"Loaded local Strong's lexicon from {p} with {len(LOCAL_STRONGS)} entries.")
-                return
-            except Exception as e:
-                print(f"Warning: Failed to load local Strong's JSON at {p}: {e}")
+            _LOCAL_STRONGS_PATH = p
+            return
     print("No local Strong's JSON found; glosses will use SWORD if available or fallback text.")
 
 
+def _ensure_local_strongs_loaded():
+    """Load the lexicon found by _find_local_strongs_json on first use.
+    Locked because pywebview serves each JS API call on its own thread.
+    """
+    global LOCAL_STRONGS, _LOCAL_STRONGS_LOADED
+    if _LOCAL_STRONGS_LOADED:
+        return
+    with _LOCAL_STRONGS_LOCK:
+        if not _LOCAL_STRONGS_LOADED:
+            if _LOCAL_STRONGS_PATH:
+                LOCAL_STRONGS = _read_local_strongs(_LOCAL_STRONGS_PATH)
+            _LOCAL_STRONGS_LOADED = True
+
+
+def _read_local_strongs(p):
+    """Read the lexicon JSON at p into a digits-keyed dict, or None on failure.
+    A pickle of the normalized dict is kept next to the JSON and reused only while it was built
+    from a JSON of the same mtime and size by the same normalization version.
+    """
+    cache_path = p + '.pickle'
+    try:
+        st = os.stat(p)
+        source_key = (_LOCAL_STRONGS_PICKLE_VERSION, st.st_mtime_ns, st.st_size)
+    except OSError as e:
+        print(f"Warning: Failed to load local Strong's JSON at {p}: {e}")
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, lexicon = pickle.load(f)
+        if cached_key == source_key:
+            print(f"Loaded local Strong's lexicon from {cache_path} with {len(lexicon)} entries.")
+            return lexicon
+    except Exception:
+        pass
+    try:
+        with open(p, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        # Normalize keys to digits only (e.g., "3056"); intern glosses so numbers sharing a gloss
+        # share one string (the pickle below keeps that sharing)
+        lexicon = {str(k).lstrip('Gg'): sys.intern(v) if isinstance(v, str) else v
+                   for k, v in data.items()}
+        print(f"Loaded local Strong's lexicon from {p} with {len(lexicon)} entries.")
+    except Exception as e:
+        print(f"Warning: Failed to load local Strong's JSON at {p}: {e}")
+        return None
+    # Per-process temp name: parallel export workers may all rebuild the pickle at once
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((source_key, lexicon), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # Read-only install (e.g., PyInstaller bundle); the JSON path still works
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return lexicon
+
+
+def _cache_ztext_blocks(bible):
+    """Keep a pysword bible's most recently inflated text blocks in memory.
+    pysword zlib-decompresses a verse's whole block on every verse read, and these modules use
+    BlockType=BOOK, so reading a chapter used to inflate the entire book once per verse.
+    """
+    decompress = getattr(bible, '_decompressed_text', None)  # pysword 0.2.x internal
+    if decompress is not None:
+        # Keyed by (testament, block number); a few blocks cover passages that cross books
+        bible._decompressed_text = functools.lru_cache(maxsize=4)(decompress)
+    return bible
+
+
 def load_sword_modules():
     """Initialize text and lexicon sources based on available backends."""
     global MORPHGNT_MODULE, STRONGSGK_MODULE, BACKEND, TRANSLATION_MODULES, SELECTED_TRANSLATION_ID
@@ -174,7 +280,7 @@ def load_sword_modules():
         try:
             mods = PySwordModules(paths=SWORD_REPO_PATH)
             mods.parse_modules()
-            MORPHGNT_MODULE = mods.get_bible_from_module(GNT_MODULE_ID)
+            MORPHGNT_MODULE = _cache_ztext_blocks(mods.get_bible_from_module(GNT_MODULE_ID))
             # pysword does not provide lexicon access; rely on local JSON
             STRONGSGK_MODULE = None
             # Try to load optional English translations
@@ -184,7 +290,7 @@ def load_sword_modules():
                 try:
                     tmod = mods.get_bible_from_module(mid)
                     if tmod:
-                        TRANSLATION_MODULES[mid] = tmod
+                        TRANSLATION_MODULES[mid] = _cache_ztext_blocks(tmod)
                         if not SELECTED_TRANSLATION_ID:
                             SELECTED_TRANSLATION_ID = mid
                         print(f"Detected translation module: {mid}")
@@ -195,10 +301,17 @@ def load_sword_modules():
             print(f"FATAL: Could not initialize pysword backend: {e}")
             sys.exit(1)
 
-    # Load local Strong's JSON fallback if present
-    _try_load_local_strongs_json()
+    # Locate local Strong's JSON fallback if present (loaded lazily on first gloss miss)
+    _find_local_strongs_json()
 
+    # Cached lookups depend on the modules above; drop anything from a previous load
+    get_strongs_gloss.cache_clear()
+    _get_translation_text.cache_clear()
+    _fetch_sword_words.cache_clear()
+    _CHAPTER_ENDS.clear()
 
+
+@functools.lru_cache(maxsize=16384)
 def get_strongs_gloss(strongs_number: str) -> str:
     """Retrieve an English gloss for a Strong's number.
     Priority: python-sword lexicon -> local JSON -> fallback string.
@@ -220,6 +333,7 @@ def get_strongs_gloss(strongs_number: str) -> str:
             pass
 
     # 2) Local Strong's JSON fallback
+    _ensure_local_strongs_loaded()
     if LOCAL_STRONGS and key_digits in LOCAL_STRONGS:
         return LOCAL_STRONGS[key_digits]
 
@@ -227,8 +341,46 @@ def get_strongs_gloss(strongs_number: str) -> str:
     return f"{num}"  # at least show the Strong's number
 
 
+# Simple roman transliteration for demo purposes
+_TRANSLIT_MAP = {'α':'a', 'β':'b', 'γ':'g', 'δ':'d', 'ε':'e', 'ζ':'z', 'η':'ē', 'θ':'th', 'ι':'i', 
+                 'κ':'k', 'λ':'l', 'μ':'m', 'ν':'n', 'ξ':'x', 'ο':'o', 'π':'p', 'ρ':'r', 'σ':'s', 
+                 'τ':'t', 'υ':'u', 'φ':'ph', 'χ':'ch', 'ψ':'ps', 'ω':'ō', 'ς':'s'}
+# Capitals map to the same (lowercase) output; unmapped characters pass through unchanged
+_TRANSLIT_TABLE = str.maketrans({
+    **{k.upper(): v for k, v in _TRANSLIT_MAP.items()},
+    **_TRANSLIT_MAP,
+})
+
+
+# Word forms repeat heavily across a passage, so cache per form rather than re-translating
+@functools.lru_cache(maxsize=16384)
+def transliterate(greek: str) -> str:
+    return greek.translate(_TRANSLIT_TABLE)
+
+
+def module_has_book(book: str):
+    """Whether the loaded MorphGNT module's versification knows this book name (full name, OSIS id
+    or abbreviation). Returns None when the backend can't tell without a verse lookup (python-sword).
+    """
+    if not MORPHGNT_MODULE or BACKEND != 'pysword':
+        return None
+    try:
+        testaments = MORPHGNT_MODULE.get_structure().get_books()
+    except Exception:
+        return None
+    return any(b.name_matches(book) for books in testaments.values() for b in books)
+
+
 def fetch_sword_data(book: str, chapter: int, verse: int) -> InterlinearVerse:
-    """Retrieve and parse interlinear data for a given verse from available backend."""
+    """Retrieve and parse interlinear data for a given verse from available backend.
+    The parse is cached per (book, chapter, verse); each call returns fresh objects built from it.
+    """
+    return _build_verse(book, chapter, verse, _fetch_sword_words(book, chapter, verse))
+
+
+@functools.lru_cache(maxsize=4096)
+def _fetch_sword_words(book: str, chapter: int, verse: int) -> tuple:
+    """Cached, immutable parse of one verse: a tuple of InterlinearWord field tuples."""
     if not MORPHGNT_MODULE:
         raise Exception("MorphGNT module not loaded.")
 
@@ -240,64 +392,95 @@ def fetch_sword_data(book: str, chapter: int, verse: int) -> InterlinearVerse:
         else:
             # pysword path: get raw OSIS/GBF/ThML with tags intact
             raw_text_with_tags = MORPHGNT_MODULE.get(books=book, chapters=chapter, verses=verse, clean=False)
-
-        verse_data = InterlinearVerse(book, chapter, verse)
     except Exception as e:
         raise Exception(f"SWORD Data Lookup Error for {verse_ref_str}: {e}")
-            
-    # Regex to find word tags and extract attributes (UNCHANGED)
-    # The 'strong' attribute in MorphGNT typically contains the G-number (e.g., G3056)
-    word_pattern = re.compile(
-        r'<w(?:\s+lemma="(?P<lemma>[^"]*)")?'
-        r'(?:\s+morph="(?P<morph>[^"]*)")?'
-        r'>(?P<greek_word>[^<]+)</w>'
-    )
-    
-    # Simple roman transliteration for demo purposes (UNCHANGED)
-    def transliterate(greek):
-        mapping = {'α':'a', 'β':'b', 'γ':'g', 'δ':'d', 'ε':'e', 'ζ':'z', 'η':'ē', 'θ':'th', 'ι':'i', 
-                   'κ':'k', 'λ':'l', 'μ':'m', 'ν':'n', 'ξ':'x', 'ο':'o', 'π':'p', 'ρ':'r', 'σ':'s', 
-                   'τ':'t', 'υ':'u', 'φ':'ph', 'χ':'ch', 'ψ':'ps', 'ω':'ō', 'ς':'s'}
-        return ''.join(mapping.get(c.lower(), c) for c in greek)
-
-    for match in word_pattern.finditer(raw_text_with_tags):
-        data = match.groupdict()
-        greek_word = (data.get('greek_word') or '').strip()
-
-        lemma_attr = (data.get('lemma') or '').strip()
-        morph_attr = (data.get('morph') or '').strip()
-
-        # Extract Greek lemma (after 'lemma.Strong:') if present
-        lemma_match = re.search(r'lemma\.Strong:([^\s]+)', lemma_attr)
-        lemma_val = lemma_match.group(1) if lemma_match else ''
-
-        # Extract Strong's number embedded in lemma attribute: strong:G0746 -> G746
-        strong_match = re.search(r'strong: *G0*(\d+)', lemma_attr, flags=re.I)
-        strongs = f"G{strong_match.group(1)}" if strong_match else ''
-        
-        # --- CRITICAL: Lookup Gloss using the Strongs number ---
-        en_gloss = get_strongs_gloss(strongs)
-        # --------------------------------------------------------
 
-        word = InterlinearWord(
-            greek_word=greek_word,
-            lemma=lemma_val,
-            morphology=morph_attr,
-            strongs_number=strongs,
-            en_gloss=en_gloss,
-            tr_transliteration=transliterate(greek_word)
-        )
-        verse_data.add_word(word)
+    return _parse_words(raw_text_with_tags)
+
+
+def fetch_chapter_raw(book: str, chapter: int, verses=None) -> list:
+    """Return the tagged MorphGNT text for verses of one chapter, in the order requested.
+    verses defaults to the whole chapter. pysword serves the chapter in a single call;
+    python-sword is queried per verse (it has no chapter-level lookup).
+    """
+    if not MORPHGNT_MODULE:
+        raise Exception("MorphGNT module not loaded.")
+
+    try:
+        if BACKEND == 'python-sword':
+            if verses is None:
+                counts = get_verse_counts(book)
+                if not counts or not 1 <= chapter <= len(counts):
+                    raise ValueError("chapter length unknown")
+                verses = range(1, counts[chapter - 1] + 1)
+            return [MORPHGNT_MODULE.get_entry(f"{book} {chapter}:{vs}") for vs in verses]
+        # pysword yields one entry per verse (empty string for verses without text)
+        if verses is not None:
+            verses = list(verses)
+        return list(MORPHGNT_MODULE.get_iter(books=book, chapters=chapter, verses=verses, clean=False))
+    except Exception as e:
+        raise Exception(f"SWORD Data Lookup Error for {book} {chapter}: {e}")
+
 
+def fetch_chapter_data(book: str, chapter: int, verses=None) -> dict:
+    """Fetch and parse verses of one chapter with one backend call. Returns {verse_number: InterlinearVerse}."""
+    if verses is None:
+        raw_texts = fetch_chapter_raw(book, chapter)
+        verses = range(1, len(raw_texts) + 1)
+    else:
+        verses = list(verses)
+        if not verses:
+            return {}
+        raw_texts = fetch_chapter_raw(book, chapter, verses)
+    return {vs: _parse_verse(book, chapter, vs, raw) for vs, raw in zip(verses, raw_texts)}
+
+
+def _parse_verse(book: str, chapter: int, verse: int, raw_text_with_tags: str) -> InterlinearVerse:
+    """Build an InterlinearVerse from one verse of tagged MorphGNT text."""
+    return _build_verse(book, chapter, verse, _parse_words(raw_text_with_tags))
+
+
+def _build_verse(book: str, chapter: int, verse: int, word_fields: tuple) -> InterlinearVerse:
+    verse_data = InterlinearVerse(sys.intern(book), chapter, verse)
+    verse_data.words = [InterlinearWord(*fields) for fields in word_fields]
     # Note: Free and Literal translation fields remain blank unless you add another translation module
     return verse_data
 
 
+def _parse_words(raw_text_with_tags: str) -> tuple:
+    """Parse the <w> tags of one verse into InterlinearWord field tuples
+    (greek_word, lemma, morphology, strongs_number, en_gloss, tr_transliteration).
+    """
+    # Book, morph codes, lemmas and Strong's numbers repeat across a passage; intern them so
+    # each distinct value is stored once. Glosses are already shared: get_strongs_gloss is
+    # cached per number and the lexicon interns its values; word forms are left alone
+    words = []
+    for match in _WORD_RE.finditer(raw_text_with_tags):
+        greek_word = match.group('greek_word').strip()
+        morph_attr = sys.intern(match.group('morph') or '')
+        lemma_val = sys.intern(match.group('lemma') or '')
+        strong_digits = match.group('strong_digits')
+        strongs = sys.intern(f"G{strong_digits}") if strong_digits else ''
+
+        # --- CRITICAL: Lookup Gloss using the Strongs number ---
+        en_gloss = get_strongs_gloss(strongs)
+        # --------------------------------------------------------
+
+        words.append((greek_word, lemma_val, morph_attr, strongs, en_gloss, transliterate(greek_word)))
+    return tuple(words)
+
+
 def get_phrase_translation(book: str, chapter: int, verse: int) -> str:
     """Return an English translation for the verse if a translation module is available; else ''."""
     if not TRANSLATION_MODULES or not SELECTED_TRANSLATION_ID:
         return ''
-    module = TRANSLATION_MODULES.get(SELECTED_TRANSLATION_ID)
+    return _get_translation_text(SELECTED_TRANSLATION_ID, book, chapter, verse)
+
+
+# Keyed by module id, so switching translations keeps earlier selections' verses warm
+@functools.lru_cache(maxsize=8192)
+def _get_translation_text(module_id: str, book: str, chapter: int, verse: int) -> str:
+    module = TRANSLATION_MODULES.get(module_id)
     if not module:
         return ''
     ref = f"{book} {chapter}:{verse}"
@@ -306,7 +489,7 @@ def get_phrase_translation(book: str, chapter: int, verse: int) -> str:
             # python-sword may include markup; strip tags crudely
             text = module.get_entry(ref)
             # Remove simple tags
-            text = re.sub(r"<[^>]+>", "", text)
+            text = _TAG_STRIP_RE.sub("", text)
             return text.strip()
         else:
             # pysword supports clean output
@@ -317,42 +500,86 @@ def get_phrase_translation(book: str, chapter: int, verse: int) -> str:
 
 # --- Range Parsing and Passage Fetching (NEW) ---
 
+def _parse_chapter_verse(text: str):
+    """Parse 'X:Y' into (X, Y); None if it is not exactly two digit runs around one colon."""
+    ch, sep, vs = text.partition(':')
+    if sep and ch.isdecimal() and vs.isdecimal():
+        return int(ch), int(vs)
+    return None
+
+
 def parse_reference_range(ref: str):
     """Parse references like 'John 1:1', 'John 1:1-1:5', or 'John 1:1-5:14' (same book).
     Returns (book, (start_ch, start_vs), (end_ch, end_vs))
     """
-    s = (ref or '').strip()
-    # Normalize multiple spaces
-    s = re.sub(r"\s+", " ", s)
-
-    # Try cross-chapter range first: Book X:Y-A:B
-    m = re.match(r"^([1-3]?[A-Za-z]+)\s+(\d+):(\d+)\s*-\s*(\d+):(\d+)$", s)
-    if m:
-        book = m.group(1)
-        sc, sv, ec, ev = map(int, (m.group(2), m.group(3), m.group(4), m.group(5)))
-        return book, (sc, sv), (ec, ev)
-
-    # Same-chapter range: Book X:Y-Z
-    m = re.match(r"^([1-3]?[A-Za-z]+)\s+(\d+):(\d+)\s*-\s*(\d+)$", s)
-    if m:
-        book = m.group(1)
-        sc, sv, ev = map(int, (m.group(2), m.group(3), m.group(4)))
-        return book, (sc, sv), (sc, ev)
-
-    # Single verse: Book X:Y
-    m = re.match(r"^([1-3]?[A-Za-z]+)\s+(\d+):(\d+)$", s)
-    if m:
-        book = m.group(1)
-        sc, sv = map(int, (m.group(2), m.group(3)))
-        return book, (sc, sv), (sc, sv)
+    parts = (ref or '').split(None, 1)
+    if len(parts) == 2:
+        book, rest = parts
+        # Book: optional leading 1-3 then ASCII letters (e.g. 'John', '1John')
+        name = book[1:] if book[0] in '123' else book
+        if name.isascii() and name.isalpha():
+            left, dash, right = rest.partition('-')
+            start = _parse_chapter_verse(left.rstrip())
+            right = right.strip()
+            if start and not dash:
+                # Single verse: Book X:Y
+                return book, start, start
+            if start and right.isdecimal():
+                # Same-chapter range: Book X:Y-Z
+                return book, start, (start[0], int(right))
+            end = _parse_chapter_verse(right)
+            if start and end:
+                # Cross-chapter range: Book X:Y-A:B
+                return book, start, end
 
     raise ValueError("Invalid reference. Try formats like 'John 1:1', 'John 1:1-18', or 'John 1:1-5:14'.")
 
 
+def get_verse_counts(book: str):
+    """Return the per-chapter verse counts for an NT book (full name or OSIS id), or None if unknown.
+    Counts come from data/nt_verse_counts.json, loaded on first use.
+    """
+    global NT_VERSE_COUNTS
+    if NT_VERSE_COUNTS is None:
+        NT_VERSE_COUNTS = {}
+        path = find_repo_path(os.path.join('data', 'nt_verse_counts.json'))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for name, entry in data.items():
+                NT_VERSE_COUNTS[name.lower()] = entry['verses']
+                NT_VERSE_COUNTS[entry['osis'].lower()] = entry['verses']
+        except Exception as e:
+            print(f"Warning: Failed to load verse counts at {path}: {e}")
+    return NT_VERSE_COUNTS.get((book or '').lower())
+
+
 def fetch_passage_data(book: str, start_ch: int, start_vs: int, end_ch: int, end_vs: int):
     """Fetch multiple verses inclusive. Assumes all within the same book.
-    Iterates verses, rolling chapters when verse stops returning content.
+    Iterates exactly the verses in range using the NT verse-count table; books missing
+    from the table fall back to probing until a verse stops returning content.
     """
+    counts = get_verse_counts(book)
+    if counts is None:
+        return _fetch_passage_data_probing(book, start_ch, start_vs, end_ch, end_vs)
+
+    verses = []
+    for ch in range(start_ch, min(end_ch, len(counts)) + 1):
+        first_vs = start_vs if ch == start_ch else 1
+        last_vs = min(end_vs, counts[ch - 1]) if ch == end_ch else counts[ch - 1]
+        if first_vs > last_vs:
+            continue
+        try:
+            chapter_data = fetch_chapter_data(book, ch, range(first_vs, last_vs + 1))
+        except Exception:
+            continue
+        # Verses absent from the Greek text (e.g. John 5:4) come back without words
+        verses.extend(vdata for vdata in chapter_data.values() if vdata.words)
+    return verses
+
+
+def _fetch_passage_data_probing(book: str, start_ch: int, start_vs: int, end_ch: int, end_vs: int):
+    """Fallback for books without verse counts: iterate verses, rolling chapters when verse stops returning content."""
     verses = []
     cur_ch, cur_vs = start_ch, start_vs
     # Safety guard to avoid infinite loops
@@ -362,15 +589,22 @@ def fetch_passage_data(book: str, start_ch: int, start_vs: int, end_ch: int, end
         count += 1
         if count > MAX_VERSES:
             break
+        # Known chapter end: roll over without another failing backend lookup
+        if cur_vs > _CHAPTER_ENDS.get((book, cur_ch), cur_vs):
+            cur_ch += 1
+            cur_vs = 1
+            continue
         try:
             vdata = fetch_sword_data(book, cur_ch, cur_vs)
         except Exception:
             # If we cannot fetch, assume boundary exceeded for this chapter; jump to next chapter
+            _CHAPTER_ENDS[(book, cur_ch)] = cur_vs - 1
             cur_ch += 1
             cur_vs = 1
             continue
 
         # Heuristic: if no words returned, consider verse invalid and move to next chapter
+        # (not remembered: a verse absent from the text, e.g. John 5:4, also has no words)
         if not vdata.words:
             cur_ch += 1
             cur_vs = 1
@@ -382,115 +616,163 @@ def fetch_passage_data(book: str, start_ch: int, start_vs: int, end_ch: int, end
     return verses
 
 
-# --- 3. FlexText XML Generation (Unchanged) ---
+# --- 3. FlexText XML Generation ---
+# Output is written as pre-escaped string fragments in the fixed FlexText layout
+# (same bytes ElementTree + indent produced, without building an element tree).
 
-def build_flextext_xml(verse_data: InterlinearVerse, config_map: dict) -> str:
-    """Generates FlexText for a single verse in the expected <document> format, without morpheme blocks."""
+_FLEXTEXT_PROLOGUE = "<?xml version='1.0' encoding='utf-8'?>\n<document version=\"2\">\n"
+_FLEXTEXT_EPILOGUE = (
+    "        </phrases>\n"
+    "      </paragraph>\n"
+    "    </paragraphs>\n"
+    "  </interlinear-text>\n"
+    "</document>"
+)
 
-    def make_title_and_abbrev(v: InterlinearVerse):
-        title = v.get_verse_ref()
-        abbrev = title.replace(' ', '').replace(':', '_')
-        return title, abbrev
 
-    baseline_key = config_map.get('baseline_data_key', 'greek_word')
-    gloss_key = config_map.get('word_gloss_data_key', 'en_gloss')
+# config_map data keys -> InterlinearWord attributes (same names as InterlinearWord.to_dict keys)
+_KEY_TO_ATTR = {
+    'greek_word': 'greek_word',
+    'lemma': 'lemma',
+    'morphology': 'morphology',
+    'strongs_number': 'strongs_number',
+    'en_gloss': 'en_gloss',
+    'tr_transliteration': 'tr_transliteration',
+}
 
-    # Root document and interlinear-text
-    doc = ET.Element('document', version='2')
-    root = ET.SubElement(doc, 'interlinear-text', guid=str(uuid.uuid4()))
-
-    # Title metadata
-    title, abbrev = make_title_and_abbrev(verse_data)
-    ET.SubElement(root, 'item', type='title', lang='en').text = title
-    ET.SubElement(root, 'item', type='title-abbreviation', lang='en').text = abbrev
-
-    # Paragraph structure
-    paragraphs = ET.SubElement(root, 'paragraphs')
-    paragraph = ET.SubElement(paragraphs, 'paragraph')
-    phrases = ET.SubElement(paragraph, 'phrases')
-    phrase = ET.SubElement(phrases, 'phrase', guid=str(uuid.uuid4()))
-
-    # Phrase-level Greek text (concatenate baseline words)
-    greek_phrase = ' '.join([w.to_dict().get(baseline_key, '') for w in verse_data.words]).strip()
-    ET.SubElement(phrase, 'item', type='txt', lang='grc').text = greek_phrase
-    # Segment number starts at 1 for single-verse export
-    ET.SubElement(phrase, 'item', type='segnum', lang='en').text = '1'
-
-    # Words
-    words_element = ET.SubElement(phrase, 'words')
-    for word_obj in verse_data.words:
-        word = ET.SubElement(words_element, 'word', guid=str(uuid.uuid4()))
-        wd = word_obj.to_dict()
-        ET.SubElement(word, 'item', type='txt', lang='grc').text = wd.get(baseline_key, '')
-        ET.SubElement(word, 'item', type='gls', lang='en').text = wd.get(gloss_key, '')
-
-    # Phrase-level English translation (prefer module; fallback to provided literal or gloss concat)
-    literal = get_phrase_translation(verse_data.book, verse_data.chapter, verse_data.verse)
-    if not literal:
-        literal = verse_data.literal_translation.strip() if verse_data.literal_translation else ''
-    if not literal:
-        literal = ' '.join([w.to_dict().get(gloss_key, '') for w in verse_data.words]).strip()
-    ET.SubElement(phrase, 'item', type='gls', lang='en').text = literal
-
-    # Finalize
-    tree = ET.ElementTree(doc)
-    if sys.version_info >= (3, 9):
-        ET.indent(tree, space="  ")
-    return ET.tostring(doc, encoding='utf-8', xml_declaration=True).decode('utf-8')
 
+def _word_field(word: InterlinearWord, key: str) -> str:
+    attr = _KEY_TO_ATTR.get(key)
+    return getattr(word, attr) if attr else ''
+
+
+def _dict_word_field(word: dict, key: str) -> str:
+    # Word dicts from the frontend use the same keys as InterlinearWord.to_dict
+    return (word.get(key) or '') if key in _KEY_TO_ATTR else ''
+
+
+def _xml_escape(text: str) -> str:
+    # Same escaping ElementTree applies to text nodes (xml.sax.saxutils pulls in urllib at import).
+    # Three no-op replace() scans beat str.translate 3-10x on typical words and glosses
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _xml_item(indent: str, item_type: str, lang: str, text: str) -> str:
+    if text:
+        return f'{indent}<item type="{item_type}" lang="{lang}">{_xml_escape(text)}</item>\n'
+    return f'{indent}<item type="{item_type}" lang="{lang}" />\n'
+
+
+def _bulk_guids(n: int) -> list:
+    """Return n random (version 4) GUID strings from a single os.urandom call."""
+    buf = bytearray(os.urandom(16 * n))
+    guids = []
+    for i in range(0, 16 * n, 16):
+        buf[i + 6] = (buf[i + 6] & 0x0F) | 0x40  # version 4
+        buf[i + 8] = (buf[i + 8] & 0x3F) | 0x80  # RFC 4122 variant
+        h = buf[i:i + 16].hex()
+        guids.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+    return guids
+
+
+def iter_flextext_chunks(verses: list, config_map: dict):
+    """Yield FlexText for verses (sequential phrases of one paragraph inside <document>) as
+    string chunks: the header, one chunk per verse, then the closing tags. Callers can write
+    the chunks straight to a file so only one verse's markup is held at a time.
+    """
+    rows = [(v.book, v.chapter, v.verse, v.words, v.literal_translation) for v in verses]
+    return _iter_flextext(rows, config_map, _word_field)
+
+
+def iter_flextext_chunks_from_dicts(verse_dicts: list, config_map: dict):
+    """Same as iter_flextext_chunks, but for verse dicts in the InterlinearVerse.to_dict shape
+    (as sent back by the frontend), read directly without rebuilding verse/word objects.
+    Each verse's shape is checked here, before any chunk is produced.
+    """
+    rows = []
+    for d in verse_dicts:
+        verse_ref = d['verse_ref']
+        words = d.get('words')
+        if not isinstance(words, list) or not all(isinstance(w, dict) for w in words):
+            raise TypeError(f"words for {verse_ref} must be a list of objects (dicts)")
+        rows.append((*_split_verse_ref(verse_ref), words, d.get('literal_translation')))
+    return _iter_flextext(rows, config_map, _dict_word_field)
 
-def build_flextext_xml_for_passage(verses: list, config_map: dict) -> str:
-    """Generates FlexText for multiple verses as separate phrases in one paragraph, wrapped in <document>."""
-    if not verses:
-        return build_flextext_xml(InterlinearVerse('','',0), config_map)
+
+def _iter_flextext(rows: list, config_map: dict, word_field):
+    # rows: (book, chapter, verse, words, literal_translation); word_field(word, key) reads one field
+    if not rows:
+        rows = [('', '', 0, [], '')]
 
     baseline_key = config_map.get('baseline_data_key', 'greek_word')
     gloss_key = config_map.get('word_gloss_data_key', 'en_gloss')
 
     # Title from first and last verse
-    first, last = verses[0], verses[-1]
-    title = f"{first.book} {first.chapter}:{first.verse}"
-    if (first.chapter, first.verse) != (last.chapter, last.verse):
-        title = f"{first.book} {first.chapter}:{first.verse}-{last.chapter}:{last.verse}"
+    (book, first_ch, first_vs, *_), (_, last_ch, last_vs, *_) = rows[0], rows[-1]
+    title = f"{book} {first_ch}:{first_vs}"
+    if (first_ch, first_vs) != (last_ch, last_vs):
+        title = f"{book} {first_ch}:{first_vs}-{last_ch}:{last_vs}"
     abbrev = title.replace(' ', '').replace(':', '_')
 
-    doc = ET.Element('document', version='2')
-    root = ET.SubElement(doc, 'interlinear-text', guid=str(uuid.uuid4()))
-    ET.SubElement(root, 'item', type='title', lang='en').text = title
-    ET.SubElement(root, 'item', type='title-abbreviation', lang='en').text = abbrev
+    yield ''.join([
+        _FLEXTEXT_PROLOGUE,
+        f'  <interlinear-text guid="{_bulk_guids(1)[0]}">\n',
+        _xml_item('    ', 'title', 'en', title),
+        _xml_item('    ', 'title-abbreviation', 'en', abbrev),
+        '    <paragraphs>\n      <paragraph>\n        <phrases>\n',
+    ])
 
-    paragraphs = ET.SubElement(root, 'paragraphs')
-    paragraph = ET.SubElement(paragraphs, 'paragraph')
-    phrases = ET.SubElement(paragraph, 'phrases')
+    for idx, (book, chapter, verse, words, literal_translation) in enumerate(rows, start=1):
+        # One GUID for the phrase plus one per word
+        next_guid = iter(_bulk_guids(1 + len(words))).__next__
+        parts = [f'          <phrase guid="{next_guid()}">\n']
+        append = parts.append
 
-    for idx, v in enumerate(verses, start=1):
-        phrase = ET.SubElement(phrases, 'phrase', guid=str(uuid.uuid4()))
+        # Read each mapped field once per word (no per-word to_dict())
+        baselines = [word_field(w, baseline_key) for w in words]
+        glosses = [word_field(w, gloss_key) for w in words]
 
         # Phrase-level baseline (full Greek text)
-        greek_phrase = ' '.join([w.to_dict().get(baseline_key, '') for w in v.words]).strip()
-        ET.SubElement(phrase, 'item', type='txt', lang='grc').text = greek_phrase
+        greek_phrase = ' '.join(baselines).strip()
+        append(_xml_item('            ', 'txt', 'grc', greek_phrase))
         # Segment number sequential starting at 1
-        ET.SubElement(phrase, 'item', type='segnum', lang='en').text = str(idx)
-
-        words_element = ET.SubElement(phrase, 'words')
-        for word_obj in v.words:
-            word = ET.SubElement(words_element, 'word', guid=str(uuid.uuid4()))
-            wd = word_obj.to_dict()
-            ET.SubElement(word, 'item', type='txt', lang='grc').text = wd.get(baseline_key, '')
-            ET.SubElement(word, 'item', type='gls', lang='en').text = wd.get(gloss_key, '')
+        append(_xml_item('            ', 'segnum', 'en', str(idx)))
+
+        if words:
+            append('            <words>\n')
+            for baseline_text, gloss_text in zip(baselines, glosses):
+                append(f'              <word guid="{next_guid()}">\n')
+                append(_xml_item('                ', 'txt', 'grc', baseline_text))
+                # Words without a gloss (no Strong's number) get no gls item
+                if gloss_text:
+                    append(_xml_item('                ', 'gls', 'en', gloss_text))
+                append('              </word>\n')
+            append('            </words>\n')
+        else:
+            append('            <words />\n')
 
         # Phrase-level English translation (prefer module; fallback to provided literal or gloss concat)
-        literal = get_phrase_translation(v.book, v.chapter, v.verse)
+        literal = get_phrase_translation(book, chapter, verse)
         if not literal:
-            literal = v.literal_translation.strip() if v.literal_translation else ''
+            literal = literal_translation.strip() if literal_translation else ''
         if not literal:
-            literal = ' '.join([w.to_dict().get(gloss_key, '') for w in v.words]).strip()
-        ET.SubElement(phrase, 'item', type='gls', lang='en').text = literal
+            literal = ' '.join(glosses).strip()
+        if literal:
+            append(_xml_item('            ', 'gls', 'en', literal))
+        append('          </phrase>\n')
+        yield ''.join(parts)
+
+    yield _FLEXTEXT_EPILOGUE
 
-    tree = ET.ElementTree(doc)
-    if sys.version_info >= (3, 9):
-        ET.indent(tree, space="  ")
-    return ET.tostring(doc, encoding='utf-8', xml_declaration=True).decode('utf-8')
+
+def build_flextext_xml(verse_data: InterlinearVerse, config_map: dict) -> str:
+    """Generates FlexText for a single verse in the expected <document> format, without morpheme blocks."""
+    return ''.join(iter_flextext_chunks([verse_data], config_map))
+
+
+def build_flextext_xml_for_passage(verses: list, config_map: dict) -> str:
+    """Generates FlexText for multiple verses as separate phrases in one paragraph, wrapped in <document>."""
+    return ''.join(iter_flextext_chunks(verses, config_map))
 
 
 # --- 4. PyWebView API Class (Unchanged, relies on updated functions) ---
@@ -555,18 +837,22 @@ class Api:
     def generate_flextext(self, verse_ref, config_map, verse_data_json):
         """Called by JS to generate the XML and save the file."""
         try:
-            # 1. Reconstruct Verse Object from JSON
-            # pywebview passes JSON-serializable JS objects as Python dicts
-            # Accept dict directly; keep backward-compat if stringified
-            if isinstance(config_map, str):
-                config_map = json.loads(config_map)
-            # Support single-verse (legacy) or passage data ({ verses: [...] })
-            if isinstance(verse_data_json, dict) and 'verses' in verse_data_json:
-                verse_list = [InterlinearVerse.from_dict(v) for v in verse_data_json['verses']]
-                flextext_xml = build_flextext_xml_for_passage(verse_list, config_map)
+            import webview
+
+            # 1. Validate the verse payload from JS
+            # pywebview passes JSON-serializable JS objects as Python dicts; strings are not re-parsed
+            if not isinstance(config_map, dict):
+                raise TypeError(f"config_map must be an object (dict), got {type(config_map).__name__}")
+            if not isinstance(verse_data_json, dict):
+                raise TypeError(f"verse data must be an object (dict), got {type(verse_data_json).__name__}")
+            # Support single-verse (legacy) or passage data ({ verses: [...] }); the dicts are
+            # written out as-is rather than rebuilt into InterlinearVerse objects (each verse's
+            # ref and words list are checked here, before the dialog)
+            if 'verses' in verse_data_json:
+                verse_dicts = list(verse_data_json['verses'])
             else:
-                verse_data = InterlinearVerse.from_dict(verse_data_json)
-                flextext_xml = build_flextext_xml(verse_data, config_map)
+                verse_dicts = [verse_data_json]
+            chunks = iter_flextext_chunks_from_dicts(verse_dicts, config_map)
 
             # 3. Trigger File Save Dialog (PyWebView built-in)
             filename = f"{verse_ref.replace(' ', '_').replace(':', '-')}.flextext"
@@ -600,9 +886,19 @@ class Api:
             # Ensure parent directory exists
             os.makedirs(os.path.dirname(final_path) or '.', exist_ok=True)
 
+            # 4. Stream the XML to a temp file one verse at a time, then move it into place,
+            # so a failure part-way never leaves a truncated file or clobbers an existing one
+            tmp_path = final_path + '.tmp'
             try:
-                with open(final_path, 'w', encoding='utf-8') as f:
-                    f.write(flextext_xml)
+                try:
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        for chunk in chunks:
+                            f.write(chunk)
+                    os.replace(tmp_path, final_path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
             except IsADirectoryError:
                 return "❌ Generation Failed: Selected path is a folder. Please choose a file name inside a writable folder."
             except PermissionError:
@@ -617,6 +913,8 @@ class Api:
 # --- 5. PyWebView Application Bootstrap ---
 
 def start_app():
+    import webview
+
     # Instantiate the API class
     api = Api()
     
@@ -16,6 +16,14 @@ import os
 import sys
 import json
 import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+# orjson (optional) serializes a whole book several times faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Ensure project root is on path
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -55,9 +63,14 @@ BOOK_NAME_VARIANTS = {
     'Revelation': ['Revelation', 'Rev', 'Apocalypse'],
 }
 
+@functools.lru_cache(maxsize=None)
 def resolve_module_book_name(preferred_book: str) -> str:
+    """Return the first name variant the loaded module serves (probes verse 1:1); cached per run."""
     variants = BOOK_NAME_VARIANTS.get(preferred_book, [preferred_book])
     for name in variants:
+        # Skip names the module's versification can't resolve instead of raising through a lookup
+        if desktop_app.module_has_book(name) is False:
+            continue
         try:
             vdata = desktop_app.fetch_sword_data(name, 1, 1)
             if vdata and vdata.words:
@@ -68,15 +81,23 @@ def resolve_module_book_name(preferred_book: str) -> str:
     return preferred_book
 
 
-def export_book(book: str, out_dir: str):
-    os.makedirs(out_dir, exist_ok=True)
-    out_path = os.path.join(out_dir, f"{book}.json")
-    result = {}
+def _iter_book_verses(module_book: str, counts: list):
+    """Yield (chapter, verse, InterlinearVerse) for every verse with words, per the verse-count table."""
+    for chapter, verse_count in enumerate(counts, start=1):
+        # One backend call per chapter rather than per verse
+        try:
+            chapter_data = desktop_app.fetch_chapter_data(module_book, chapter, range(1, verse_count + 1))
+        except Exception as e:
+            print(f"  Skipping {module_book} {chapter}: {e}")
+            continue
+        for verse, vdata in chapter_data.items():
+            # Verses absent from the text (e.g. John 5:4) come back without words
+            if vdata.words:
+                yield chapter, verse, vdata
 
-    module_book = resolve_module_book_name(book)
-    if module_book != book:
-        print(f"  Using module book name '{module_book}' for '{book}'")
 
+def _probe_book_verses(module_book: str):
+    """Yield (chapter, verse, InterlinearVerse) by probing, for books missing from the verse-count table."""
     # Simple discovery: iterate chapters starting at 1, verses from 1, stop when a chapter starts with 3 consecutive empty verses
     # This is resilient across modules without a chapter/verse manifest.
     consecutive_empty_chapters = 0
@@ -98,22 +119,7 @@ def export_book(book: str, out_dir: str):
             else:
                 empty_verses_in_row = 0
                 any_verse_in_chapter = True
-                # Build verse payload
-                words = []
-                for w in vdata.words:
-                    wd = w.to_dict()
-                    words.append({
-                        'g': wd.get('greek_word', ''),
-                        'S': wd.get('strongs_number', ''),
-                        'gls': wd.get('en_gloss', ''),
-                        'l': wd.get('lemma', ''),
-                    })
-                tr = desktop_app.get_phrase_translation(module_book, chapter, verse) or ''
-                key = f"{chapter}:{verse}"
-                result[key] = {
-                    'words': words,
-                    'translation': tr,
-                }
+                yield chapter, verse, vdata
             verse += 1
 
         if any_verse_in_chapter:
@@ -126,31 +132,127 @@ def export_book(book: str, out_dir: str):
             break
         chapter += 1
 
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False)
+
+def _dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON; orjson and the stdlib fallback produce identical bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def export_book(book: str, out_dir: str):
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir, f"{book}.json")
+
+    module_book = resolve_module_book_name(book)
+    if module_book != book:
+        print(f"  Using module book name '{module_book}' for '{book}'")
+
+    # Walk exactly the verses the NT verse-count table lists; probe only for books it doesn't know
+    counts = desktop_app.get_verse_counts(book)
+    if counts is not None:
+        verses = _iter_book_verses(module_book, counts)
+    else:
+        verses = _probe_book_verses(module_book)
+
+    # Stream the {"chapter:verse": {...}} object to disk one verse at a time rather than holding
+    # the whole book in memory; write to a temp file so a failed export leaves the old file intact
+    tmp_path = out_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            sep = b'{'
+            for chapter, verse, vdata in verses:
+                # Build verse payload straight from the word attributes (no per-word to_dict())
+                words = [{
+                    'g': w.greek_word,
+                    'S': w.strongs_number,
+                    'gls': w.en_gloss,
+                    'l': w.lemma,
+                } for w in vdata.words]
+                tr = desktop_app.get_phrase_translation(module_book, chapter, verse) or ''
+                key = f"{chapter}:{verse}"
+                f.write(sep + _dumps(key) + b':' + _dumps({
+                    'words': words,
+                    'translation': tr,
+                }))
+                sep = b','
+            f.write(b'{}' if sep == b'{' else b'}')
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
     return out_path
 
 
+# Everything an exported book is derived from; a book JSON newer than all of these is up to date
+EXPORT_INPUTS = [
+    'sword_repo',
+    os.path.join('data', 'strongs_greek.json'),
+    os.path.join('data', 'strongs_greek.sample.json'),
+    os.path.join('data', 'nt_verse_counts.json'),
+    'app.py',
+    os.path.join('tools', 'export_web_data.py'),
+]
+
+
+def newest_input_mtime() -> float:
+    newest = 0.0
+    for rel in EXPORT_INPUTS:
+        path = os.path.join(ROOT, rel)
+        if os.path.isdir(path):
+            for dirpath, _dirs, files in os.walk(path):
+                for name in files:
+                    newest = max(newest, os.path.getmtime(os.path.join(dirpath, name)))
+        elif os.path.exists(path):
+            newest = max(newest, os.path.getmtime(path))
+    return newest
+
+
+def is_up_to_date(book: str, out_dir: str, inputs_mtime: float) -> bool:
+    out_path = os.path.join(out_dir, f"{book}.json")
+    return os.path.exists(out_path) and os.path.getmtime(out_path) > inputs_mtime
+
+
 def main():
     parser = argparse.ArgumentParser(description="Export per-book JSON for web app")
     parser.add_argument('--books', type=str, required=True, help='Comma-separated list of NT books, e.g., John,Mark,Matthew')
     parser.add_argument('--out', type=str, default=os.path.join(ROOT, 'docs', 'assets', 'data'))
+    parser.add_argument('--force', action='store_true', help='Re-export books even if their JSON is newer than the modules, lexicon and exporter code')
     args = parser.parse_args()
 
-    # Initialize SWORD modules once
-    desktop_app.load_sword_modules()
-
     books = [b.strip() for b in args.books.split(',') if b.strip()]
+    if not args.force:
+        inputs_mtime = newest_input_mtime()
+        fresh = [b for b in books if is_up_to_date(b, args.out, inputs_mtime)]
+        for b in fresh:
+            print(f"Skipping {b}: {b}.json is up to date (use --force to re-export)")
+        books = [b for b in books if b not in fresh]
     produced = []
-    for b in books:
-        print(f"Exporting {b}…")
-        path = export_book(b, args.out)
-        produced.append(path)
-        print(f"  -> {path}")
+    workers = min(len(books), os.cpu_count() or 1)
+    if workers > 1:
+        # Books are independent and each writes its own file, so export them in separate
+        # processes; every worker opens its own SWORD modules
+        print(f"Exporting {len(books)} books on {workers} processes…")
+        with ProcessPoolExecutor(max_workers=workers, initializer=desktop_app.load_sword_modules) as ex:
+            for b, path in zip(books, ex.map(functools.partial(export_book, out_dir=args.out), books)):
+                produced.append(path)
+                print(f"  {b} -> {path}")
+    elif books:
+        # Initialize SWORD modules once
+        desktop_app.load_sword_modules()
+        for b in books:
+            print(f"Exporting {b}…")
+            path = export_book(b, args.out)
+            produced.append(path)
+            print(f"  -> {path}")
 
     print("Done. Files written:")
     for p in produced:
         print(" -", p)
+    if workers == 1:
+        # Cache stats live in the worker processes when exporting in parallel
+        print(f"Strong's gloss cache: {desktop_app.get_strongs_gloss.cache_info()}")
 
 
 if __name__ == '__main__':
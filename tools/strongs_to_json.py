@@ -29,19 +29,42 @@ Notes:
 """
 import argparse
 import csv
-import io
+import itertools
 import json
 import os
 import re
 import sys
 from typing import Dict, Any, Iterable
 
+# orjson (optional) writes the output faster; the stdlib fallback produces identical bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Precompiled patterns for the per-entry normalizers
+_STRONGS_PREFIX_RE = re.compile(r'^[Gg]\s*0*')
+_NON_DIGIT_RE = re.compile(r'\D')
+_GLOSS_SPLIT_RE = re.compile(r'[;\n\r]+')
+# A bare Strong's number value (e.g. "G3056" or 3056) when sniffing JSON object fields
+_STRONGS_VALUE_RE = re.compile(r'^[Gg]?\d+$')
+
+# First characters of a row's first cell that mark blank, separator (=====, -----) or comment lines
+_SKIP_FIRST = frozenset(('', '=', '-', '#'))
+
+# Column-sniffing checks used when scoring sample rows
+_GREEK_RE = re.compile('[\u0370-\u03FF]')
+_ASCII_ALPHA_RE = re.compile(r'[A-Za-z]')
+_MORPH_TAG_RE = re.compile(r'^[A-Za-z]+[:\-]')
+_MACRON_RE = re.compile(r'[ĀāĒēĪīŌōŪūḗḕḖȳȲ]')
+
 
 def normalize_strongs(num: str) -> str:
     s = (num or '').strip()
-    s = re.sub(r'^[Gg]\s*0*', '', s)  # strip leading G/g and zeros
-    s = re.sub(r'\D', '', s)  # keep digits only
-    return s
+    s = _STRONGS_PREFIX_RE.sub('', s, count=1)  # strip leading G/g and zeros
+    # keep digits only (most values already are, so skip the second pass for them)
+    return s if s.isdecimal() else _NON_DIGIT_RE.sub('', s)
 
 
 def normalize_gloss(text: str) -> str:
@@ -49,163 +72,149 @@ def normalize_gloss(text: str) -> str:
         return ''
     t = str(text).strip()
     # Take a concise first segment before semicolon or newline
-    t = re.split(r'[;\n\r]+', t)[0].strip()
+    t = _GLOSS_SPLIT_RE.split(t, maxsplit=1)[0].strip()
     return t
 
 
 def load_from_csv(path: str, has_header: bool, delimiter: str, num_field: str = None, gloss_field: str = None) -> Dict[str, str]:
+    # Inputs are read as utf-8-sig so a spreadsheet-exported BOM doesn't stick to the first header name
     out = {}
-    with open(path, 'r', encoding='utf-8') as f:
-        lines = f.read().splitlines()
-
-    # If header is expected but the file has a preamble, find the real header line
-    start_idx = 0
-    if has_header:
-        def looks_like_header(cols):
-            cols_lower = [c.strip().lower() for c in cols]
-            candidates_num = [num_field, 'estrong#', 'strong', 'strongs', 'id', 'num', 'key']
-            candidates_gls = [gloss_field, 'gloss', 'definition', 'def', 'short', 'english']
-            found_num = any(c and c.lower() in cols_lower for c in candidates_num)
-            found_gls = any(c and c.lower() in cols_lower for c in candidates_gls)
-            return found_num and found_gls
-
-        for i, ln in enumerate(lines):
-            cols = [c for c in ln.split(delimiter)]
-            if len(cols) >= 2 and looks_like_header(cols):
-                start_idx = i
-                break
-        else:
-            # Fallback: find first data row starting with G-digits
-            for i, ln in enumerate(lines):
-                if ln and ln[0] in ('G', 'g'):
-                    start_idx = i
+
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        # Rows are parsed straight from the open file, in the same pass that finds the header
+        rdr = csv.reader(f, delimiter=delimiter)
+
+        # If header is expected but the file has a preamble, find the real header line
+        # (preamble lines are checked raw, so stray quotes in prose can't swallow the header)
+        if has_header:
+            def looks_like_header(cols):
+                cols_lower = [c.strip().lower() for c in cols]
+                candidates_num = [num_field, 'estrong#', 'strong', 'strongs', 'id', 'num', 'key']
+                candidates_gls = [gloss_field, 'gloss', 'definition', 'def', 'short', 'english']
+                found_num = any(c and c.lower() in cols_lower for c in candidates_num)
+                found_gls = any(c and c.lower() in cols_lower for c in candidates_gls)
+                return found_num and found_gls
+
+            for ln in f:
+                cols = ln.rstrip('\n').split(delimiter)
+                if len(cols) >= 2 and looks_like_header(cols):
+                    # Hand the header line back to the reader; the file is positioned just after it
+                    rdr = csv.reader(itertools.chain([ln], f), delimiter=delimiter)
+                    break
+            else:
+                # Fallback: find first data row starting with G-digits (rescans the file, only for
+                # inputs without a recognisable header)
+                f.seek(0)
+                first_g = next((i for i, ln in enumerate(f) if ln[0] in ('G', 'g')), None)
+                f.seek(0)
+                if first_g is not None:
                     has_header = False
+                    rdr = csv.reader(itertools.islice(f, first_g, None), delimiter=delimiter)
+                else:
+                    rdr = csv.reader(f, delimiter=delimiter)
+
+        if has_header:
+            header = next(rdr, [])
+            # Column name -> position (first occurrence wins, as with list.index)
+            header_idx = {}
+            for i, h in enumerate(header):
+                header_idx.setdefault(h.strip().lower(), i)
+
+            def idx_of(name_opts: Iterable[str]) -> int:
+                return next((header_idx[name.lower()] for name in name_opts
+                             if name and name.lower() in header_idx), -1)
+
+            ni = idx_of([num_field, 'estrong#', 'strong', 'strongs', 'id', 'num', 'key'])
+            gi = idx_of([gloss_field, 'gloss', 'definition', 'def', 'short', 'english'])
+            greek_i = idx_of(['greek'])
+            translit_i = idx_of(['transliteration', 'translit'])
+            if ni < 0 or gi < 0:
+                raise ValueError(f"Could not detect num/gloss columns. Header: {header}")
+            # Heuristic: some STEPBible files label columns 'Greek, Transliteration, Gloss' but actual data order is 'Gloss, Greek, Transliteration'.
+            # Probe the next ~100 rows to see which column looks most like an English gloss.
+            sample_rows = []
+            for _ in range(100):
+                try:
+                    row = next(rdr)
+                except StopIteration:
                     break
-
-    # Build a reader from the detected start
-    buf = io.StringIO("\n".join(lines[start_idx:]) + "\n")
-    rdr = csv.reader(buf, delimiter=delimiter)
-
-    if has_header:
-        header = next(rdr)
-        header_lower = [h.strip().lower() for h in header]
-
-        def idx_of(name_opts: Iterable[str]) -> int:
-            for name in name_opts:
-                if name and name.lower() in header_lower:
-                    return header_lower.index(name.lower())
-            return -1
-
-        ni = idx_of([num_field, 'estrong#', 'strong', 'strongs', 'id', 'num', 'key'])
-        gi = idx_of([gloss_field, 'gloss', 'definition', 'def', 'short', 'english'])
-        greek_i = idx_of(['greek'])
-        translit_i = idx_of(['transliteration', 'translit'])
-        if ni < 0 or gi < 0:
-            raise ValueError(f"Could not detect num/gloss columns. Header: {header}")
-        # Heuristic: some STEPBible files label columns 'Greek, Transliteration, Gloss' but actual data order is 'Gloss, Greek, Transliteration'.
-        # Probe the next ~100 rows to see which column looks most like an English gloss.
-        sample_rows = []
-        for _ in range(100):
-            try:
-                row = next(rdr)
-            except StopIteration:
-                break
-            sample_rows.append(row)
-        # Rewind reader for actual processing
-        buf2 = io.StringIO("\n".join([delimiter.join(header)] + [delimiter.join(r) for r in sample_rows] + list(buf.readlines())))
-        rdr = csv.reader(buf2, delimiter=delimiter)
-        next(rdr)  # skip header
-
-        def is_greek_text(s: str) -> bool:
-            return any('\u0370' <= ch <= '\u03FF' for ch in s)
-
-        def looks_like_gloss(s: str) -> bool:
-            if not s:
-                return False
-            if is_greek_text(s):
-                return False
-            if re.search(r'[A-Za-z]', s) is None:
-                return False
-            # Allow spaces and punctuation; discourage colon patterns typical of morph tags
-            if ':' in s and re.match(r'^[A-Za-z]+[:\-]', s):
-                return False
-            return True
-
-        # First: check if the header-labelled 'Greek' column actually contains Greek.
-        def frac_has_greek(col_idx: int) -> float:
-            if col_idx is None or col_idx < 0:
-                return 0.0
-            tot = 0
-            hit = 0
+                sample_rows.append(row)
+
+            # One pass over the sample gathers, per column of interest: rows that have the column,
+            # rows whose cell contains Greek, and an English-gloss score
+            stat_cols = {c for c in (gi, greek_i, translit_i) if c >= 0}
+            present = dict.fromkeys(stat_cols, 0)
+            greek_hits = dict.fromkeys(stat_cols, 0)
+            gloss_score = dict.fromkeys(stat_cols, 0)
             for row in sample_rows:
-                if len(row) <= col_idx:
+                row_len = len(row)
+                for c in stat_cols:
+                    if row_len <= c:
+                        continue
+                    present[c] += 1
+                    s = (row[c] or '').strip()
+                    if not s:
+                        continue
+                    has_greek = _GREEK_RE.search(s) is not None
+                    if has_greek:
+                        greek_hits[c] += 1
+                    # English-like tokens: Latin letters, no Greek; discourage colon patterns typical of morph tags
+                    elif _ASCII_ALPHA_RE.search(s) and not (':' in s and _MORPH_TAG_RE.match(s)):
+                        gloss_score[c] += 1
+                    # Prefer phrases with spaces/hyphens (more likely English gloss than transliteration)
+                    if ' ' in s or '-' in s:
+                        gloss_score[c] += 1
+                    # Penalize macrons/diacritics that suggest transliteration (āēīōū ḗ ṓ etc.)
+                    if _MACRON_RE.search(s):
+                        gloss_score[c] -= 1
+
+            # First: check if the header-labelled 'Greek' column actually contains Greek.
+            def frac_has_greek(col_idx: int) -> float:
+                if col_idx < 0 or not present[col_idx]:
+                    return 0.0
+                return greek_hits[col_idx] / present[col_idx]
+
+            greek_frac = frac_has_greek(greek_i)
+            gloss_header_frac = frac_has_greek(gi)
+
+            # If the 'Greek' column rarely has Greek text but the 'Gloss' header column never has Greek,
+            # assume the file's actual order is 'Gloss, Greek, Transliteration' and pick the header 'Greek' position as gloss.
+            if greek_i >= 0 and gi >= 0:
+                if greek_frac < 0.3 and gloss_header_frac < 0.1:
+                    gi = greek_i
+
+            # Otherwise, fall back to content-based scoring between candidates
+            candidates = [c for c in [gi, greek_i, translit_i] if c >= 0]
+            if candidates:
+                scores = {c: gloss_score[c] for c in candidates}
+                gi = max(scores, key=lambda k: scores[k])
+            # The sampled rows were already parsed; process them, then the rest of the reader
+            min_len = max(ni, gi) + 1
+            ns, ng = normalize_strongs, normalize_gloss
+            for row in itertools.chain(sample_rows, rdr):
+                # skip blank, separator or comment lines
+                if not row or row[0].strip()[:1] in _SKIP_FIRST:
                     continue
-                tot += 1
-                if is_greek_text((row[col_idx] or '')):
-                    hit += 1
-            return (hit / tot) if tot else 0.0
-
-        greek_frac = frac_has_greek(greek_i)
-        gloss_header_frac = frac_has_greek(gi)
-
-        # If the 'Greek' column rarely has Greek text but the 'Gloss' header column never has Greek,
-        # assume the file's actual order is 'Gloss, Greek, Transliteration' and pick the header 'Greek' position as gloss.
-        if greek_i >= 0 and gi >= 0:
-            if greek_frac < 0.3 and gloss_header_frac < 0.1:
-                gi = greek_i
-        
-        # Otherwise, fall back to content-based scoring between candidates
-        candidates = [c for c in [gi, greek_i, translit_i] if c >= 0]
-        def score_col(c: int) -> int:
-            score = 0
-            for row in sample_rows:
-                if len(row) <= c:
+                if len(row) < min_len:
                     continue
-                s = (row[c] or '').strip()
-                if not s:
+                num = ns(row[ni])
+                if num:
+                    out[num] = ng(row[gi])
+        else:
+            for row in rdr:
+                if not row:
                     continue
-                # English-like tokens
-                if looks_like_gloss(s):
-                    score += 1
-                # Prefer phrases with spaces/hyphens (more likely English gloss than transliteration)
-                if ' ' in s or '-' in s:
-                    score += 1
-                # Penalize macrons/diacritics that suggest transliteration (āēīōū ḗ ṓ etc.)
-                if re.search(r'[ĀāĒēĪīŌōŪūḗḕḖḕȳȲ]', s):
-                    score -= 1
-            return score
-
-        if candidates:
-            scores = {c: score_col(c) for c in candidates}
-            gi = max(scores, key=lambda k: scores[k])
-        for row in rdr:
-            if not row:
-                continue
-            # skip separator or comment lines
-            first = (row[0] or '').strip()
-            if not first or first.startswith('=') or first.startswith('-'):
-                continue
-            if len(row) <= max(ni, gi):
-                continue
-            num = normalize_strongs(row[ni])
-            gloss = normalize_gloss(row[gi])
-            if num:
-                out[num] = gloss
-    else:
-        for row in rdr:
-            if not row:
-                continue
-            if len(row) < 2:
-                continue
-            num = normalize_strongs(row[0])
-            gloss = normalize_gloss(row[1])
-            if num:
-                out[num] = gloss
+                if len(row) < 2:
+                    continue
+                num = normalize_strongs(row[0])
+                gloss = normalize_gloss(row[1])
+                if num:
+                    out[num] = gloss
     return out
 
 
 def load_from_json(path: str, num_field: str = None, gloss_field: str = None) -> Dict[str, str]:
-    with open(path, 'r', encoding='utf-8') as f:
+    with open(path, 'r', encoding='utf-8-sig') as f:
         data = json.load(f)
     out: Dict[str, str] = {}
     if isinstance(data, dict):
@@ -216,27 +225,19 @@ def load_from_json(path: str, num_field: str = None, gloss_field: str = None) ->
             if num:
                 out[num] = gloss
     elif isinstance(data, list):
-        # array of objects
+        # array of objects; candidate keys in priority order (unset CLI fields dropped)
+        keys_num = tuple(k for k in (num_field, 'strong', 'strongs', 'id', 'num', 'key') if k)
+        keys_gls = tuple(k for k in (gloss_field, 'gloss', 'definition', 'def', 'short', 'english') if k)
         for obj in data:
             if not isinstance(obj, dict):
                 continue
             # try explicit keys first
-            keys_num = [num_field, 'strong', 'strongs', 'id', 'num', 'key']
-            keys_gls = [gloss_field, 'gloss', 'definition', 'def', 'short', 'english']
-            num_val = None
-            gls_val = None
-            for k in keys_num:
-                if k and k in obj:
-                    num_val = obj[k]
-                    break
-            for k in keys_gls:
-                if k and k in obj:
-                    gls_val = obj[k]
-                    break
+            num_val = next((obj[k] for k in keys_num if k in obj), None)
+            gls_val = next((obj[k] for k in keys_gls if k in obj), None)
             if num_val is None or gls_val is None:
                 # try to detect fields heuristically
                 for k, v in obj.items():
-                    if num_val is None and isinstance(v, (str, int)) and re.match(r'^[Gg]?\d+$', str(v)):
+                    if num_val is None and isinstance(v, (str, int)) and _STRONGS_VALUE_RE.match(str(v)):
                         num_val = v
                     if gls_val is None and isinstance(v, str) and len(v) > 0:
                         gls_val = v
@@ -279,8 +280,12 @@ def main():
 
     # Write out JSON
     os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(out_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(out_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
     print(f"Wrote {len(data)} entries to {out_path}")
 